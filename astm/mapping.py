@@ -9,20 +9,23 @@
 
 import datetime
 import decimal
-import inspect
+import keyword
+import re
 import time
 import warnings
-from operator import itemgetter
+import weakref
 from itertools import islice
-try:
-    from itertools import izip_longest
-except ImportError: # Python 3
-    from itertools import zip_longest as izip_longest
-    from .compat import basestring, unicode, long
+from operator import attrgetter
+from types import FunctionType
+from .compat import basestring, unicode, long
 
 
-def make_string(value):
-    if isinstance(value, unicode):
+_INT_TYPES = (int, long)
+_DECIMAL_TYPES = (int, long, float, decimal.Decimal)
+
+
+def make_string(value, unicode=unicode, bytes=bytes, type=type):
+    if type(value) is unicode:
         return value
     elif isinstance(value, bytes):
         return unicode(value, 'utf-8')
@@ -30,43 +33,206 @@ def make_string(value):
         return unicode(value)
 
 
+# max amount of parsed date/time values to keep
+_STRPTIME_CACHE_SIZE = 1024
+_strptime_cache = {}
+
+def _strptime(value, format):
+    """Memoized :meth:`datetime.datetime.strptime`."""
+    key = (value, format)
+    try:
+        return _strptime_cache[key]
+    except KeyError:
+        pass
+    result = datetime.datetime.strptime(value, format)
+    if len(_strptime_cache) >= _STRPTIME_CACHE_SIZE:
+        _strptime_cache.clear()
+    _strptime_cache[key] = result
+    return result
+
+
+class _NotBuilt(object):
+    """Raw value of fields which default value is built on first access.
+    Stays the same object through copying and pickling."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return '_NOT_BUILT'
+
+    def __reduce__(self):
+        return '_NOT_BUILT'
+
+_NOT_BUILT = _NotBuilt()
+
+
 class Field(object):
     """Base mapping field class."""
+    # whenever default value should be built on first access
+    _lazy = False
+    # mapping classes which have field default and requirement built in
+    _owners = None
+
     def __init__(self, name=None, default=None, required=False, length=None):
         self.name = name
         self.default = default
         self.required = required
         self.length = length
+        # raw values of fields without own decoding are returned as is
+        self._decodes = type(self)._get_value != Field._get_value
+
+    def __setattr__(self, name, value):
+        # keep cached default kind in sync, since it's checked on every read
+        if name == 'default':
+            object.__setattr__(self, '_default_is_callable', callable(value))
+        object.__setattr__(self, name, value)
+        if name in ('default', 'required'):
+            for cls in list(self._owners or ()):
+                _update_mapping(cls)
 
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        value = instance._data.get(self.name)
-        if value is not None:
-            value = self._get_value(value)
-        elif self.default is not None:
-            default = self.default
-            if hasattr(default, '__call__'):
-                default = default()
-            value = default
+        value = getattr(instance, self._slot, None)
+        if value is None:
+            if self._default_is_callable:
+                return self.default()
+            return self.default
+        if self._decodes:
+            return self._get_value(value)
         return value
 
     def __set__(self, instance, value):
         if value is not None:
             value = self._set_value(value)
-        instance._data[self.name] = value
+        setattr(instance, self._slot, value)
 
     def _get_value(self, value):
         return value
 
+    def _encode(self, value):
+        if value is None and self.required:
+            raise ValueError('Field %r value should not be None' % self.name)
+        return value
+
     def _set_value(self, value):
-        value = make_string(value)
+        if type(value) is not unicode:
+            value = make_string(value)
         if self.length is not None and len(value) > self.length:
             raise ValueError('Field %r value is too long (max %d, got %d)'
                             '' % (self.name, self.length, len(value)))
         return value
 
 
+_IDENTIFIER = re.compile('^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _shared_raw_default(field):
+    """Returns raw value of constant field default if it could be shared
+    between records."""
+    if field._default_is_callable:
+        return None
+    try:
+        value = field._set_value(field.default)
+    except Exception:
+        return None
+    if isinstance(value, basestring):
+        return value
+
+
+def _make_init(cls, fields):
+    """Generates constructor with positional parameter per each field.
+    Keyword arguments override positional ones, as in :meth:`Mapping.__init__`.
+    Missing values with constant defaults are assigned directly to slots.
+    Field defaults are built in, so it gets regenerated when they change.
+    Instances of subclasses, which reach it through custom constructors, are
+    handled by generic :meth:`Mapping.__init__`.
+
+    Returns ``None`` if field names could not be used as attribute names.
+    """
+    namespace = {'_cls': cls, '_generic': Mapping.__dict__['__init__'],
+                 '_NOT_BUILT': _NOT_BUILT}
+    params = []
+    pops = []
+    lines = []
+    for idx, (attrname, field) in enumerate(fields):
+        if keyword.iskeyword(attrname) or not _IDENTIFIER.match(attrname):
+            return None
+        param = '_p%d' % idx
+        params.append(param)
+        pops.append('        %s = _kwargs.pop(%r, %s)'
+                    '' % (param, attrname, param))
+        default = '_default_%d' % idx
+        raw = None
+        if field._lazy:
+            raw = '_NOT_BUILT'
+        elif field.default is None:
+            raw = 'None'
+        else:
+            value = _shared_raw_default(field)
+            if value is not None:
+                namespace[default] = value
+                raw = default
+        if raw is not None:
+            lines.extend(['    if %s is None:' % param,
+                          '        self.%s = %s' % (field._slot, raw),
+                          '    else:',
+                          '        self.%s = %s' % (attrname, param)])
+            continue
+        namespace[default] = field.default
+        if field._default_is_callable:
+            default += '()'
+        lines.append('    self.%s = %s if %s is not None else %s'
+                     '' % (attrname, param, param, default))
+    if len(params) > 250:
+        return None
+    source = '\n'.join([
+        'def __init__(%s):' % ', '.join(
+            ['self'] + ['%s=None' % param for param in params]
+            + ['*_args', '**_kwargs']),
+        '    if self.__class__ is not _cls:',
+        '        return _generic(%s)' % ', '.join(
+            ['self'] + params + ['*_args', '**_kwargs']),
+        '    if _args:',
+        '        raise ValueError(\'Unexpected args found: %r\' % (_args,))',
+        '    if _kwargs:',
+    ] + pops + [
+        '        if _kwargs:',
+        '            raise ValueError(\'Unexpected kwargs found: %r\''
+        ' % _kwargs)',
+    ] + lines) + '\n'
+    exec(compile(source, '<%s.__init__>' % cls.__name__, 'exec'), namespace)
+    init = namespace['__init__']
+    init._generic = True
+    return init
+
+
+def _make_encoders(fields):
+    """Returns encoders by field index. Plain values are passed to ASTM record
+    as is, so only fields with own encoding or requirements are left."""
+    return tuple((idx, field._encode) for idx, field in enumerate(fields)
+                 if field.required or type(field)._encode != Field._encode)
+
+
+def _update_mapping(cls):
+    """Updates mapping class parts built from field defaults and
+    requirements."""
+    cls._encoders = _make_encoders(cls._fieldobjs)
+    init = cls.__dict__.get('__init__')
+    if getattr(init, '_generic', False) \
+    and init is not Mapping.__dict__['__init__']:
+        cls.__init__ = _make_init(cls, cls._fields)
+
+
+def _make_values_getter(slots):
+    """Returns function that gets raw values of all fields as tuple."""
+    if len(slots) > 1:
+        return attrgetter(*slots)
+    elif slots:
+        getter = attrgetter(*slots)
+        return lambda obj: (getter(obj),)
+    return lambda obj: ()
+
+
 class MetaMapping(type):
 
     def __new__(mcs, name, bases, d):
@@ -81,56 +247,115 @@ class MetaMapping(type):
                     names.append(name)
                 else:
                     fields[names.index(name)] = (name, field)
-        for base in bases:
-            if hasattr(base, '_fields'):
-                merge_fields(base._fields)
-        merge_fields([(k, v) for k, v in d.items() if isinstance(v, Field)])
-        if '_fields' not in d:
-            d['_fields'] = fields
-        else:
+        if d.pop('_built', False):
+            # built mappings have exactly given fields in given order
             merge_fields(d['_fields'])
-            d['_fields'] = fields
-        return super(MetaMapping, mcs).__new__(mcs, name, bases, d)
-
-
-_MappingProxy = MetaMapping('_MappingProxy', (object,), {}) # Python 3 workaround
+        else:
+            for base in bases:
+                if hasattr(base, '_fields'):
+                    merge_fields(base._fields)
+            merge_fields([(k, v) for k, v in d.items()
+                          if isinstance(v, Field)])
+            if '_fields' in d:
+                merge_fields(d['_fields'])
+        d['_fields'] = fields
+        d['_fieldnames'] = tuple(attrname for attrname, field in fields)
+        d['_fieldobjs'] = fieldobjs = tuple(field for attrname, field in fields)
+        # field values are stored in slots named after fields, but prefixed
+        # to not clash with field descriptors. Fields could be shared between
+        # mappings, so slot name depends only on the field itself
+        inherited = set()
+        for base in bases:
+            for klass in getattr(base, '__mro__', ()):
+                inherited.update(getattr(klass, '__slots__', ()))
+        slots = list(d.get('__slots__', ()))
+        for field in fieldobjs:
+            field._slot = '_v_' + field.name
+            if field._slot not in inherited and field._slot not in slots:
+                slots.append(field._slot)
+        d['__slots__'] = tuple(slots)
+        d['_slots'] = tuple(field._slot for field in fieldobjs)
+        d['_slot_values'] = staticmethod(_make_values_getter(d['_slots']))
+        d['_encoders'] = _make_encoders(fieldobjs)
+        cls = super(MetaMapping, mcs).__new__(mcs, name, bases, d)
+        # generate constructor unless there is a custom one
+        if '__init__' not in d and getattr(cls.__init__, '_generic', False):
+            init = _make_init(cls, fields)
+            if init is None:
+                init = Mapping.__dict__['__init__']
+            cls.__init__ = init
+        # to update class once some field default or requirement get changed
+        for field in fieldobjs:
+            if field._owners is None:
+                field._owners = weakref.WeakKeyDictionary()
+            field._owners[cls] = True
+        return cls
+
+
+# instance dict is left for any extra attributes; it is allocated only on
+# first use, while field values always go to slots
+_MappingProxy = MetaMapping('_MappingProxy', (object,),
+                            {'__slots__': ('__dict__',)}) # Python 3 workaround
 
 class Mapping(_MappingProxy):
+    """Base class for ASTM records and components.
+
+    Field values are stored in slots, so mappings which both define own fields
+    could not be combined with multiple inheritance; declare their fields on
+    single class instead, fields could be shared between mappings.
+    """
 
     def __init__(self, *args, **kwargs):
-        fieldnames = map(itemgetter(0), self._fields)
-        values = dict(izip_longest(fieldnames, args))
-        values.update(kwargs)
-        self._data = {}
-        for attrname, field in self._fields:
-            attrval = values.pop(attrname, None)
+        nargs = len(args)
+        if nargs > len(self._fieldnames):
+            raise ValueError('Unexpected args found: %r'
+                             '' % (args[len(self._fieldnames):],))
+        fields = zip(self._fieldnames, self._fieldobjs)
+        for index, (attrname, field) in enumerate(fields):
+            attrval = args[index] if index < nargs else None
+            if attrname in kwargs:
+                attrval = kwargs.pop(attrname)
             if attrval is None:
-                setattr(self, attrname, getattr(self, attrname))
-            else:
-                setattr(self, attrname, attrval)
-        if values:
-            raise ValueError('Unexpected kwargs found: %r' % values)
+                if field._lazy:
+                    setattr(self, field._slot, _NOT_BUILT)
+                    continue
+                attrval = getattr(self, attrname)
+            setattr(self, attrname, attrval)
+        if kwargs:
+            raise ValueError('Unexpected kwargs found: %r' % kwargs)
+    __init__._generic = True
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for slot in self._slots:
+            if hasattr(self, slot):
+                state[slot] = getattr(self, slot)
+        return state
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
 
     @classmethod
     def build(cls, *a):
         fields = []
-        newcls = type('Generic' + cls.__name__, (cls,), {})
         for field in a:
             if field.name is None:
                 raise ValueError('Name is required for ordered fields.')
-            setattr(newcls, field.name, field)
             fields.append((field.name, field))
-        newcls._fields = fields
-        return newcls
+        d = dict(fields)
+        d['_fields'] = fields
+        d['_built'] = True
+        return type(cls)('Generic' + cls.__name__, (cls,), d)
 
     def __getitem__(self, key):
         return self.values()[key]
 
     def __setitem__(self, key, value):
-        setattr(self, self._fields[key][0], value)
+        setattr(self, self._fieldnames[key], value)
 
     def __delitem__(self, key):
-        self._data[self._fields[key][0]] = None
+        setattr(self, self._fieldnames[key], None)
 
     def __iter__(self):
         return iter(self.values())
@@ -139,12 +364,26 @@ class Mapping(_MappingProxy):
         return item in self.values()
 
     def __len__(self):
-        return len(self._data)
+        return len(self._fieldnames)
 
     def __eq__(self, other):
-        if len(self) != len(other):
-            return False
-        for key, value in zip(self.keys(), other):
+        if isinstance(other, Mapping) and (
+                type(self) is type(other)
+                or self._fieldobjs == other._fieldobjs):
+            # raw values are normalized on assignment by the same fields, so
+            # they are enough to compare unless they differ: defaults are
+            # applied on read
+            for key, slot in zip(self._fieldnames, self._slots):
+                if getattr(self, slot, None) != getattr(other, slot, None) \
+                and getattr(self, key) != getattr(other, key):
+                    return False
+            return True
+        try:
+            if len(self._fieldnames) != len(other):
+                return False
+        except TypeError:
+            return NotImplemented
+        for key, value in zip(self._fieldnames, other):
             if getattr(self, key) != value:
                 return False
         return True
@@ -157,34 +396,27 @@ class Mapping(_MappingProxy):
                            ', '.join('%s=%r' % (key, value)
                                      for key, value in self.items()))
 
+    @property
+    def _data(self):
+        """Raw field values mapped by field names."""
+        return dict((key, None if value is _NOT_BUILT else value)
+                    for key, value in zip(self._fieldnames,
+                                          self._slot_values(self)))
+
     def keys(self):
-        return [key for key, field in self._fields]
+        return list(self._fieldnames)
 
     def values(self):
-        return [getattr(self, key) for key in self.keys()]
+        return [getattr(self, key) for key in self._fieldnames]
 
     def items(self):
-        return [(key, getattr(self, key)) for key, field in self._fields]
+        return [(key, getattr(self, key)) for key in self._fieldnames]
 
     def to_astm(self):
-        def values(obj):
-            for key, field in obj._fields:
-                value = obj._data[key]
-                if isinstance(value, Mapping):
-                    yield list(values(value))
-                elif isinstance(value, list):
-                    stack = []
-                    for item in value:
-                        if isinstance(item, Mapping):
-                            stack.append(list(values(item)))
-                        else:
-                            stack.append(item)
-                    yield stack
-                elif value is None and field.required:
-                    raise ValueError('Field %r value should not be None' % key)
-                else:
-                    yield value
-        return list(values(self))
+        values = list(self._slot_values(self))
+        for idx, encode in self._encoders:
+            values[idx] = encode(values[idx])
+        return values
 
 
 class Record(Mapping):
@@ -197,8 +429,8 @@ class Component(Mapping):
 
 class TextField(Field):
     """Mapping field for string values."""
-    def _set_value(self, value):
-        if not isinstance(value, basestring):
+    def _set_value(self, value, isinstance=isinstance, types=basestring):
+        if not isinstance(value, types):
             raise TypeError('String value expected, got %r' % value)
         return super(TextField, self)._set_value(value)
 
@@ -223,6 +455,12 @@ class ConstantField(Field):
         if self.default is None:
             raise ValueError('Constant value should be defined')
 
+    def __setattr__(self, name, value):
+        # raw constant should be ready before constructors get regenerated
+        if name == 'default' and value is not None:
+            object.__setattr__(self, '_raw_default', make_string(value))
+        super(ConstantField, self).__setattr__(name, value)
+
     def _get_value(self, value):
         return self.default
 
@@ -231,7 +469,7 @@ class ConstantField(Field):
         if self.default != value:
             raise ValueError('Field changing not allowed: got %r, accepts %r'
                             '' % (value, self.default))
-        return super(ConstantField, self)._set_value(value)
+        return self._raw_default
 
 
 class IntegerField(Field):
@@ -239,13 +477,13 @@ class IntegerField(Field):
     def _get_value(self, value):
         return int(value)
 
-    def _set_value(self, value):
-        if not isinstance(value, (int, long)):
+    def _set_value(self, value, isinstance=isinstance, types=_INT_TYPES):
+        if not isinstance(value, types):
             try:
                 value = self._get_value(value)
             except Exception:
                 raise TypeError('Integer value expected, got %r' % value)
-        return super(IntegerField, self)._set_value(value)
+        return super(IntegerField, self)._set_value(unicode(value))
 
 
 class DecimalField(Field):
@@ -253,17 +491,17 @@ class DecimalField(Field):
     def _get_value(self, value):
         return decimal.Decimal(value)
 
-    def _set_value(self, value):
-        if not isinstance(value, (int, long, float, decimal.Decimal)):
+    def _set_value(self, value, isinstance=isinstance, types=_DECIMAL_TYPES):
+        if not isinstance(value, types):
             raise TypeError('Decimal value expected, got %r' % value)
-        return super(DecimalField, self)._set_value(value)
+        return super(DecimalField, self)._set_value(unicode(value))
 
 
 class DateField(Field):
     """Mapping field for storing date/time values."""
     format = '%Y%m%d'
     def _get_value(self, value):
-        return datetime.datetime.strptime(value, self.format)
+        return _strptime(value, self.format)
 
     def _set_value(self, value):
         if isinstance(value, basestring):
@@ -300,7 +538,7 @@ class DateTimeField(Field):
     """Mapping field for storing date/time values."""
     format = '%Y%m%d%H%M%S'
     def _get_value(self, value):
-        return datetime.datetime.strptime(value, self.format)
+        return _strptime(value, self.format)
 
     def _set_value(self, value):
         if isinstance(value, basestring):
@@ -317,7 +555,8 @@ class SetField(Field):
                  values=None, field=Field()):
         super(SetField, self).__init__(name, default, required, length)
         self.field = field
-        self.values = values and set(values) or set([])
+        self.values = frozenset(values) if values else frozenset()
+        self._inner_set = field._set_value
 
     def _get_value(self, value):
         return self.field._get_value(value)
@@ -326,16 +565,38 @@ class SetField(Field):
         value = self.field._get_value(value)
         if value not in self.values:
             raise ValueError('Unexpectable value %r' % value)
-        return self.field._set_value(value)
+        return self._inner_set(value)
 
 
 class ComponentField(Field):
-    """Mapping field for storing record component."""
+    """Mapping field for storing record component. Default component is built
+    on first access to the field."""
+    _lazy = True
+
     def __init__(self, mapping, name=None, default=None):
         self.mapping = mapping
-        default = default or mapping()
+        if default is None:
+            default = mapping
         super(ComponentField, self).__init__(name, default)
 
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self._slot, None)
+        if value is _NOT_BUILT:
+            value = self._build_default()
+            setattr(instance, self._slot, value)
+            return value
+        if value is None:
+            # explicitly unset component; building one here would lose any
+            # changes made to it
+            return None
+        return super(ComponentField, self).__get__(instance, owner)
+
+    def _build_default(self):
+        if self._default_is_callable:
+            return self._set_value(self.default())
+        return self._set_value(self.default)
 
     def _get_value(self, value):
         if isinstance(value, dict):
@@ -345,7 +606,16 @@ class ComponentField(Field):
         else:
             return self.mapping(*value)
 
+    def _encode(self, value):
+        if value is _NOT_BUILT:
+            value = self._build_default()
+        elif value is None:
+            return super(ComponentField, self)._encode(value)
+        return value.to_astm()
+
     def _set_value(self, value):
+        if type(value) is self.mapping:
+            return value
         if isinstance(value, dict):
             return self.mapping(**value)
         elif isinstance(value, self.mapping):
@@ -354,6 +624,17 @@ class ComponentField(Field):
             value = [value]
         return self.mapping(*value)
 
+    def _set_values(self, values):
+        """Returns list of raw values for a sequence of components."""
+        if type(values) is list:
+            mapping = self.mapping
+            for item in values:
+                if type(item) is not mapping:
+                    break
+            else:
+                return list(values)
+        return [self._set_value(item) for item in values]
+
 
 class RepeatedComponentField(Field):
     """Mapping field for storing list of record components."""
@@ -363,7 +644,8 @@ class RepeatedComponentField(Field):
         else:
             assert isinstance(field, type) and issubclass(field, Mapping)
             self.field = ComponentField(field)
-        default = default or []
+        if default is None:
+            default = list
         super(RepeatedComponentField, self).__init__(name, default)
 
     class Proxy(list):
@@ -372,11 +654,17 @@ class RepeatedComponentField(Field):
             self.list = seq
             self.field = field
 
+        def _decoded(self):
+            # underlying list is shared with the record and other proxies,
+            # so decoded items are reused within single operation only
+            get_value = self.field._get_value
+            return [get_value(item) for item in self.list]
+
         def _to_list(self):
-            return [list(self.field._get_value(item)) for item in self.list]
+            return [list(item) for item in self._decoded()]
 
         def __add__(self, other):
-            obj = type(self)(self.list, self.field)
+            obj = type(self)(list(self.list), self.field)
             obj.extend(other)
             return obj
 
@@ -422,10 +710,16 @@ class RepeatedComponentField(Field):
             del self.list[index]
 
         def __getitem__(self, index):
+            if isinstance(index, slice):
+                return self.__class__(self.list[index], self.field)
             return self.field._get_value(self.list[index])
 
         def __setitem__(self, index, value):
-            self.list[index] = self.field._set_value(value)
+            if isinstance(index, slice):
+                value = self.field._set_values(value)
+            else:
+                value = self.field._set_value(value)
+            self.list[index] = value
 
         def __delslice__(self, i, j):
             del self.list[i:j]
@@ -434,17 +728,13 @@ class RepeatedComponentField(Field):
             return self.__class__(self.list[i:j], self.field)
 
         def __setslice__(self, i, j, seq):
-            self.list[i:j] = [self.field._set_value(v) for v in seq]
+            self.list[i:j] = self.field._set_values(seq)
 
         def __contains__(self, value):
-            for item in self:
-                if item == value:
-                    return True
-            return False
+            return value in self._decoded()
 
         def __iter__(self):
-            for index in range(len(self)):
-                yield self[index]
+            return iter(self._decoded())
 
         def __len__(self):
             return len(self.list)
@@ -462,16 +752,17 @@ class RepeatedComponentField(Field):
             self.list.append(self.field._set_value(item))
 
         def count(self, value):
-            return self._to_list().count(value)
+            return self._decoded().count(value)
 
         def extend(self, other):
-            self.list.extend([self.field._set_value(i) for i in other])
+            self.list.extend(self.field._set_values(other))
 
         def index(self, value, start=None, stop=None):
             start = start or 0
-            for idx, item in enumerate(islice(self, start, stop)):
+            items = islice(self._decoded(), start, stop)
+            for idx, item in enumerate(items, start):
                 if item == value:
-                    return idx + start
+                    return idx
             else:
                 raise ValueError('%r not in list' % value)
 
@@ -479,32 +770,35 @@ class RepeatedComponentField(Field):
             self.list.insert(index, self.field._set_value(object))
 
         def remove(self, value):
-            for item in self:
-                if item == value:
-                    return self.list.remove(value)
-            raise ValueError('Value %r not in list' % value)
+            try:
+                self.list.remove(self.field._set_value(value))
+            except (TypeError, ValueError):
+                raise ValueError('Value %r not in list' % value)
 
         def pop(self, index=-1):
-            return self.field._get_value(self.list.pop(index))
+            value = self.list.pop(index)
+            return self.field._get_value(value)
 
         def sort(self, cmp=None, key=None, reverse=False):
             raise NotImplementedError('In place sorting not allowed.')
 
     # update docstrings from list
-    for name, obj in inspect.getmembers(Proxy):
-        if getattr(list, name, None) is None\
-        or name in ['__module__', '__doc__']:
-            continue
-        if not inspect.isfunction(obj):
-            continue
-        obj.__doc__ = getattr(list, name).__doc__
+    for name, obj in vars(Proxy).items():
+        if isinstance(obj, FunctionType) and hasattr(list, name):
+            obj.__doc__ = getattr(list, name).__doc__
     del name, obj
 
     def _get_value(self, value):
         return self.Proxy(value, self.field)
 
+    def _encode(self, value):
+        if value is None:
+            return super(RepeatedComponentField, self)._encode(value)
+        return [item.to_astm() if isinstance(item, Mapping) else item
+                for item in value]
+
     def _set_value(self, value):
-        return [self.field._set_value(item) for item in value]
+        return self.field._set_values(value)
 
 
 class NotUsedField(Field):
@@ -7,13 +7,26 @@
 # you should have received as part of this distribution.
 #
 
+import copy
 import datetime
 import decimal
+import pickle
 import unittest
 import warnings
 from astm import mapping
 from astm.compat import u
 
+class PickleComponent(mapping.Component):
+    a = mapping.IntegerField()
+    b = mapping.IntegerField()
+    c = mapping.IntegerField()
+
+
+class PickleDummy(mapping.Mapping):
+    foo = mapping.Field(default='bar')
+    bar = mapping.ComponentField(mapping=PickleComponent, default=[1, 2, 3])
+
+
 class FieldTestCase(unittest.TestCase):
 
     def test_init_default(self):
@@ -36,6 +49,27 @@ class FieldTestCase(unittest.TestCase):
             field = mapping.Field(default=lambda: 'foobar')
         self.assertEqual(Dummy().field, 'foobar')
 
+    def test_change_default_value(self):
+        class Dummy(mapping.Mapping):
+            field = mapping.Field(default='foo')
+        obj = Dummy()
+        obj.field = None
+        Dummy.field.default = lambda: 'bar'
+        self.assertEqual(obj.field, 'bar')
+        self.assertEqual(Dummy().field, 'bar')
+        Dummy.field.default = 'baz'
+        self.assertEqual(obj.field, 'baz')
+        self.assertEqual(Dummy().field, 'baz')
+
+    def test_change_constant_default_value(self):
+        class Dummy(mapping.Mapping):
+            field = mapping.ConstantField(default='foo')
+        Dummy.field.default = 'bar'
+        self.assertEqual(Dummy().field, 'bar')
+        self.assertEqual(Dummy().to_astm(), ['bar'])
+        self.assertEqual(Dummy(field='bar').to_astm(), ['bar'])
+        self.assertRaises(ValueError, Dummy, field='foo')
+
 
 class NotUsedFieldTestCase(unittest.TestCase):
 
@@ -382,6 +416,53 @@ class ComponentFieldTestCase(unittest.TestCase):
         obj = self.Dummy(field=['foo', 14, '42'])
         self.assertEqual(obj.field, ['foo', 14, '42'])
 
+    def test_default_value_built_on_access(self):
+        built = []
+        def default():
+            built.append(True)
+            return ['foo', None, '42']
+        class Dummy(self.Dummy):
+            field = mapping.ComponentField(self.Dummy.field.mapping,
+                                           default=default)
+        obj = Dummy()
+        self.assertEqual(built, [])
+        self.assertEqual(obj._data['field'], None)
+        obj.field.foo = 'bar'
+        self.assertEqual(obj.field.foo, 'bar')
+        self.assertEqual(len(built), 1)
+        self.assertEqual(obj.to_astm(), [['bar', None, '42']])
+
+    def test_copy_not_built_default(self):
+        obj = self.Dummy()
+        for copy_obj in (copy.copy(obj), copy.deepcopy(obj)):
+            self.assertEqual(copy_obj.to_astm(), [[None, None, '42']])
+            copy_obj.field.foo = 'bar'
+            self.assertEqual(copy_obj.to_astm(), [['bar', None, '42']])
+        self.assertEqual(obj.field.foo, None)
+
+    def test_pickle_not_built_default(self):
+        obj = PickleDummy()
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy_obj = pickle.loads(pickle.dumps(obj, proto))
+            self.assertEqual(copy_obj.bar, [1, 2, 3])
+            self.assertEqual(copy_obj.to_astm(), ['bar', ['1', '2', '3']])
+
+    def test_explicit_none_value(self):
+        obj = self.Dummy()
+        obj.field = None
+        self.assertEqual(obj.field, None)
+        self.assertEqual(obj.to_astm(), [None])
+        obj.field = ['foo', 14, '42']
+        obj.field.foo = 'bar'
+        self.assertEqual(obj.to_astm(), [['bar', '14', '42']])
+
+    def test_default_value_is_not_shared(self):
+        obj1 = self.Dummy()
+        obj2 = self.Dummy()
+        obj1.field.foo = 'bar'
+        self.assertEqual(obj1.field.foo, 'bar')
+        self.assertEqual(obj2.field.foo, None)
+
     def test_set_value(self):
         obj = self.Dummy()
         self.assertRaises(TypeError, setattr, obj, 'field', 42)
@@ -435,6 +516,14 @@ class RepeatedComponentFieldTestCase(unittest.TestCase):
         obj.field = [['foo', 42]]
         self.assertEqual(obj.field, [['foo', 42]])
 
+    def test_set_components(self):
+        items = [self.Dummy.field.field.mapping('foo', 42)]
+        obj = self.Dummy(field=items)
+        self.assertEqual(obj.field, [['foo', 42]])
+        self.assertTrue(obj.field[0] is items[0])
+        items.append(['bar', 24])
+        self.assertEqual(len(obj.field), 1)
+
     def test_fail_on_set_strings(self):
         obj = self.Dummy()
         obj.field = 'foo' # WHY?
@@ -507,6 +596,7 @@ class RepeatedComponentFieldTestCase(unittest.TestCase):
     def test_fail_proxy_remove_missing(self):
         obj = self.Thing(numbers=[[1], [2], [3]])
         self.assertRaises(ValueError, obj.numbers.remove, [5])
+        self.assertRaises(ValueError, obj.numbers.remove, 5)
 
     def test_proxy_pop(self):
         obj = self.Thing(numbers=[[1], [2], [3]])
@@ -527,6 +617,17 @@ class RepeatedComponentFieldTestCase(unittest.TestCase):
         del obj.numbers[3:]
         self.assertEquals(len(obj.numbers), 3)
 
+    def test_proxy_sees_changes_through_other_proxy(self):
+        obj = self.Thing(numbers=[[1]])
+        proxy = obj.numbers
+        self.assertEqual(list(proxy), [[1]])
+        obj.numbers.append([2])
+        obj.numbers[0] = [3]
+        self.assertEqual(len(proxy), 2)
+        self.assertEqual(list(proxy), [[3], [2]])
+        self.assertEqual(proxy[1], [2])
+        self.assertTrue([3] in proxy)
+
     def test_proxy_sort_fails(self):
         class Dummy(mapping.Mapping):
             numbers = mapping.RepeatedComponentField(
@@ -599,6 +700,21 @@ class RepeatedComponentFieldTestCase(unittest.TestCase):
         self.assertTrue(isinstance(l, list))
         self.assertTrue(obj.numbers is not l)
 
+    def test_proxy_add_keeps_original(self):
+        obj = self.Thing(numbers=[[1], [2], [3]])
+        obj.numbers + [[4]]
+        self.assertEqual(obj.numbers, [[1], [2], [3]])
+
+    def test_proxy_mutations_seen_on_next_iteration(self):
+        obj = self.Thing(numbers=[[1], [2], [3]])
+        numbers = obj.numbers
+        self.assertEqual(list(numbers), [[1], [2], [3]])
+        numbers.append([4])
+        numbers[0] = [0]
+        del numbers[1]
+        self.assertEqual(list(numbers), [[0], [3], [4]])
+        self.assertTrue([4] in numbers)
+
     def test_proxy_add_other_proxy(self):
         obj1 = self.Thing(numbers=[[1], [2], [3]])
         obj2 = self.Thing(numbers=[[4], [5], [6]])
@@ -670,6 +786,32 @@ class MappingTestCase(unittest.TestCase):
         self.assertEqual(obj, ['foo', (3, 2, 1)])
         self.assertNotEqual(obj, ['foo'])
 
+    def test_build_replaces_fields(self):
+        Dummy = self.Dummy.build(mapping.Field(name='x'),
+                                 mapping.Field(name='foo'))
+        obj = Dummy('1', '2')
+        self.assertEqual(obj.keys(), ['x', 'foo'])
+        self.assertEqual(obj.to_astm(), ['1', '2'])
+        self.assertEqual(self.Dummy().keys(), ['foo', 'bar'])
+
+    def test_equal_compares_decoded_values_of_other_fields(self):
+        Int = mapping.Record.build(mapping.IntegerField(name='v'))
+        Text = mapping.Record.build(mapping.TextField(name='v'))
+        self.assertNotEqual(Int(1), Text('1'))
+        self.assertEqual(Int(1), Int('1'))
+        self.assertEqual(Text('1'), Text('1'))
+
+    def test_equal_mappings(self):
+        obj = self.Dummy('foo', [3, 2, 1])
+        self.assertEqual(obj, self.Dummy('foo', [3, 2, 1]))
+        self.assertNotEqual(obj, self.Dummy('foo', [1, 2, 3]))
+        del obj[0]
+        self.assertEqual(obj, self.Dummy('bar', [3, 2, 1]))
+
+    def test_not_equal_to_non_sequence(self):
+        obj = self.Dummy('foo', [3, 2, 1])
+        self.assertNotEqual(obj, 42)
+
     def test_iter(self):
         obj = self.Dummy('foo', [3, 2, 1])
         self.assertEqual(list(obj), ['foo', [3, 2, 1]])
@@ -703,6 +845,9 @@ class MappingTestCase(unittest.TestCase):
         obj = self.Thing(numbers=[[4, 2], [2, 3], [0, 1]])
         self.assertEqual(obj.to_astm(), [[['4', '2'], ['2', '3'], ['0', '1']]])
 
+    def test_to_astm_without_fields(self):
+        self.assertEqual(mapping.Record().to_astm(), [])
+
     def test_required_field(self):
         class Dummy(mapping.Mapping):
             field = mapping.Field(required=True)
@@ -710,6 +855,108 @@ class MappingTestCase(unittest.TestCase):
         self.assertTrue(obj.field is None)
         self.assertRaises(ValueError, obj.to_astm)
 
+    def test_change_required_field(self):
+        class Dummy(mapping.Mapping):
+            field = mapping.Field()
+        class Child(Dummy):
+            pass
+        Dummy.field.required = True
+        self.assertRaises(ValueError, Dummy().to_astm)
+        self.assertRaises(ValueError, Child().to_astm)
+        Dummy.field.required = False
+        self.assertEqual(Dummy().to_astm(), [None])
+
+    def test_init_defaults(self):
+        class Dummy(mapping.Mapping):
+            foo = mapping.IntegerField(default=42)
+            bar = mapping.Field()
+            baz = mapping.TextField(default=lambda: 'baz')
+        obj = Dummy()
+        self.assertEqual(obj._data, {'foo': '42', 'bar': None, 'baz': 'baz'})
+        self.assertEqual(Dummy(foo=1, bar='bar')._data,
+                         {'foo': '1', 'bar': 'bar', 'baz': 'baz'})
+
+    def test_init_changed_defaults(self):
+        class Dummy(mapping.Mapping):
+            foo = mapping.IntegerField(default=42)
+            bar = mapping.Field()
+        class Child(Dummy):
+            baz = mapping.Field()
+        self.assertEqual(Dummy().foo, 42)
+        Dummy.foo.default = 24
+        Dummy.bar.default = lambda: 'bar'
+        self.assertEqual(Dummy()._data, {'foo': '24', 'bar': 'bar'})
+        self.assertEqual(Child()._data,
+                         {'foo': '24', 'bar': 'bar', 'baz': None})
+
+    def test_init_keyword_overrides_positional(self):
+        Generated = mapping.Record.build(mapping.Field(name='a'),
+                                         mapping.Field(name='b'))
+        Generic = mapping.Record.build(mapping.Field(name='a'),
+                                       mapping.Field(name='from'))
+        generic_init = mapping.Mapping.__dict__['__init__']
+        self.assertFalse(Generated.__dict__['__init__'] is generic_init)
+        self.assertTrue(Generic.__dict__['__init__'] is generic_init)
+        for cls in (Generated, Generic):
+            self.assertEqual(cls('1', a='2').a, '2')
+            self.assertEqual(cls('1', a=None).a, None)
+
+    def test_fail_on_unexpected_args(self):
+        self.assertRaises(ValueError, self.Dummy, 'foo', [3, 2, 1], 'bar')
+        self.assertRaises(ValueError, self.Dummy, baz='foo')
+
+    def test_init_through_parent_custom_constructor(self):
+        class Parent(mapping.Mapping):
+            foo = mapping.Field(default='bar')
+            def __init__(self, *args, **kwargs):
+                super(Parent, self).__init__(*args, **kwargs)
+        class Child(Parent):
+            baz = mapping.Field()
+        obj = Child(baz='42')
+        self.assertEqual(obj.foo, 'bar')
+        self.assertEqual(obj.baz, '42')
+        self.assertEqual(Child('foo', '42').baz, '42')
+
+    def test_init_with_non_identifier_field_names(self):
+        Dummy = mapping.Component.build(
+            mapping.Field(name='class'),
+            mapping.Field(name='self', default='foo')
+        )
+        obj = Dummy('bar')
+        self.assertEqual(obj, ['bar', 'foo'])
+
+    def test_share_field_between_mappings(self):
+        class Foo(mapping.Mapping):
+            x = mapping.Field()
+        class Bar(mapping.Mapping):
+            y = Foo.x
+        self.assertEqual(Foo(x='1').x, '1')
+        self.assertEqual(Bar(y='2').y, '2')
+        self.assertEqual(Foo(x='1').to_astm(), ['1'])
+
+    def test_values_not_in_instance_dict(self):
+        obj = self.Dummy('foo', [3, 2, 1])
+        obj.baz = 42
+        self.assertEqual(obj.__dict__, {'baz': 42})
+        self.assertEqual(obj.to_astm(), ['foo', ['3', '2', '1']])
+
+    def test_subclass_with_extra_attributes(self):
+        class Dummy(self.Dummy):
+            def __init__(self, *args, **kwargs):
+                super(Dummy, self).__init__(*args, **kwargs)
+                self.seen = True
+        obj = Dummy('foo')
+        self.assertTrue(obj.seen)
+        self.assertEqual(obj.foo, 'foo')
+
+    def test_pickle(self):
+        obj = PickleDummy('foo', [3, 2, 1])
+        obj.baz = 42
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy_obj = pickle.loads(pickle.dumps(obj, proto))
+            self.assertEqual(copy_obj, obj)
+            self.assertEqual(copy_obj.baz, 42)
+
     def test_field_max_length(self):
         class Dummy(mapping.Mapping):
             field = mapping.Field(length=10)